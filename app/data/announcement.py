@@ -11,3 +11,5 @@ class Announcement(BaseModel):
     thumbnail: str | None = None
     createdAt: Optional[datetime] = Field(default_factory=datetime.now)
     updatedAt: Optional[datetime] = Field(default_factory=datetime.now)
+    publishAt: Optional[datetime] = None
+    expiresAt: Optional[datetime] = None
@@ -1,8 +1,27 @@
+from functools import lru_cache
+
 import motor.motor_asyncio
 from fastapi.security import OAuth2PasswordBearer
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from passlib.context import CryptContext
+
 from app.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/authentication/credential")
 
-client = motor.motor_asyncio.AsyncIOMotorClient(settings.MONGO_URL)
-database = client.dayder
+
+@lru_cache
+def get_database() -> AsyncIOMotorDatabase:
+    """
+    Creates the Mongo client on first use and returns the application database.
+    """
+    client = motor.motor_asyncio.AsyncIOMotorClient(settings.MONGO_URL)
+    return client.dayder
+
+
+@lru_cache
+def get_pwd_context() -> CryptContext:
+    """
+    Creates the bcrypt password context on first use.
+    """
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
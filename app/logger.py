@@ -1,3 +1,195 @@
+import copy
+import json
 import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-logger = logging.getLogger("__name__")
\ No newline at end of file
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.settings import settings
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Attaches the id of the current request to the record.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread, and drops records instead of
+    blocking when the queue is full. As in QueueHandler, the message and
+    traceback are rendered in the calling thread so that later changes to
+    the arguments are not logged and no frames are kept alive in the queue;
+    the JSON serialization happens in the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(JsonFormatter())
+
+_queue_handler = NonBlockingQueueHandler(_queue)
+_queue_handler.addFilter(RequestIdFilter())
+
+_listener = QueueListener(_queue, _stream_handler, respect_handler_level=True)
+_listening = False
+
+logger = logging.getLogger("app")
+logger.setLevel(settings.LOG_LEVEL)
+logger.addHandler(_queue_handler)
+logger.propagate = False
+
+access_logger = logging.getLogger("app.access")
+
+
+def configure_uvicorn_logging() -> None:
+    """
+    Routes the uvicorn server logs through the queue and turns off the
+    uvicorn access log, which would write one line per request from the
+    event loop. Requests are logged by AccessLogMiddleware instead.
+    """
+    uvicorn_logger = logging.getLogger("uvicorn")
+    uvicorn_logger.handlers = [_queue_handler]
+    uvicorn_logger.propagate = False
+    uvicorn_error_logger = logging.getLogger("uvicorn.error")
+    uvicorn_error_logger.handlers = []
+    uvicorn_error_logger.propagate = True
+    # uvicorn only writes access logs when this logger has handlers.
+    uvicorn_access_logger = logging.getLogger("uvicorn.access")
+    uvicorn_access_logger.handlers = []
+    uvicorn_access_logger.propagate = False
+
+
+def start_logging() -> None:
+    """
+    Starts the background thread that writes queued records.
+    uvicorn configures its loggers before importing the application,
+    so they are taken over here.
+    """
+    configure_uvicorn_logging()
+    logger.handlers = [_queue_handler]
+    global _listening
+    if not _listening:
+        _listener.start()
+        _listening = True
+
+
+def stop_logging() -> None:
+    """
+    Writes the remaining queued records and stops the background thread.
+    """
+    global _listening
+    if _listening:
+        _listener.stop()
+        _listening = False
+    # Records logged after the application shut down, e.g. by cancelled
+    # background tasks or by uvicorn, are written directly.
+    logger.handlers = [_stream_handler]
+    logging.getLogger("uvicorn").handlers = [_stream_handler]
+
+
+class AccessLogMiddleware:
+    """
+    Assigns every request an id, taken from the X-Request-ID header when
+    present, and logs a sampled fraction of requests. Server errors are
+    always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500 or random.random() < self.sample_rate:
+                access_logger.info(
+                    "%s %s %d",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    extra={"fields": {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    }},
+                )
+            request_id_var.reset(token)
@@ -1,19 +1,72 @@
+import asyncio
+import time
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi_pagination import add_pagination
 
-from app.routers import announcements, authentication, users
+from app.logger import AccessLogMiddleware, logger, start_logging, stop_logging
+from app.profiling import ProfiledJSONResponse, ProfilingMiddleware
+from app.routers import announcements, authentication, health, profiles, users
+from app.settings import settings
+from app.startup import StartupReport
+
+
+async def bootstrap_admin(startup: StartupReport) -> None:
+    """
+    Creates the default admin user and records whether the bootstrap succeeded.
+    """
+    startup.admin_bootstrap = "done" if await users.create_default_admin() else "failed"
+
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
-    await users.create_default_admin()
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    start_logging()
+    startup = app.state.startup
+    bootstrap = None
+    if settings.ADMIN_BOOTSTRAP == "skip":
+        startup.admin_bootstrap = "skipped"
+    elif settings.ADMIN_BOOTSTRAP == "blocking":
+        await bootstrap_admin(startup)
+    else:
+        bootstrap = asyncio.create_task(bootstrap_admin(startup))
+    archiver = None
+    if settings.ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS > 0:
+        archiver = asyncio.create_task(announcements.run_announcement_archiver())
+    startup.startup_ms = (time.perf_counter() - started) * 1000
+    logger.info("Imported in %.1f ms, started in %.1f ms", startup.import_ms, startup.startup_ms)
     yield
+    tasks = [task for task in (bootstrap, archiver) if task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stop_logging()
 
 app = FastAPI(
     title="DAYDER",
     version="0.2.0",
     description="DAYDER API",
     lifespan=lifespan,
+    **({"default_response_class": ProfiledJSONResponse} if settings.PROFILING_ENABLED else {}),
+)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.PROFILING_DIR,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        slow_ms=settings.PROFILING_SLOW_MS,
+        max_files=settings.PROFILING_MAX_FILES,
+    )
+    app.include_router(
+        profiles.router,
+        prefix="/api/profiles",
+        tags=["profiles"],
+    )
+
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
 )
 
 app.include_router(
@@ -34,4 +87,12 @@ app.include_router(
     tags=['announcements'],
 )
 
+app.include_router(
+    health.router,
+    prefix="/api/health",
+    tags=["health"],
+)
+
 add_pagination(app)
+
+app.state.startup = StartupReport()
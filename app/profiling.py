@@ -0,0 +1,202 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Coroutine, Iterator, List, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logger import logger
+from app.settings import settings
+
+_spans: ContextVar[List[Tuple[str, float]] | None] = ContextVar("profiling_spans", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Records the wall time of the enclosed block against the current request.
+    Does nothing when the request is not being profiled.
+    """
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, (time.perf_counter() - start) * 1000))
+
+
+class ProfiledJSONResponse(JSONResponse):
+    """
+    JSON response whose rendering time is recorded as the 'render' span.
+    """
+
+    def render(self, content) -> bytes:
+        with span("render"):
+            return super().render(content)
+
+
+class ProfiledResponseField:
+    """
+    Wraps a response model field so that validating and serializing the
+    endpoint result are recorded as the 'validate_response' and
+    'serialize_response' spans.
+    """
+
+    def __init__(self, field):
+        self._field = field
+
+    def __getattr__(self, name: str):
+        return getattr(self._field, name)
+
+    def validate(self, *args, **kwargs):
+        with span("validate_response"):
+            return self._field.validate(*args, **kwargs)
+
+    def serialize(self, *args, **kwargs):
+        with span("serialize_response"):
+            return self._field.serialize(*args, **kwargs)
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route that records response model validation and serialization spans
+    when profiling is enabled.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        field = self.secure_cloned_response_field
+        # The handler is rebuilt when routes are re-initialized, e.g. by add_pagination.
+        if settings.PROFILING_ENABLED and field is not None and not isinstance(field, ProfiledResponseField):
+            self.secure_cloned_response_field = ProfiledResponseField(field)
+        return super().get_route_handler()
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a random fraction of requests with cProfile and records a span
+    breakdown for every request. Profiles of sampled requests, and span
+    breakdowns of requests slower than the threshold, are written as JSON
+    files to a directory that keeps only the most recent max_files entries.
+
+    cProfile hooks the whole event loop thread, not a single task. A request
+    is therefore only sampled when no other request is in flight, but
+    requests arriving while it runs and background tasks are still included
+    in its profile and slowed down by the profiler. Such profiles are marked
+    as overlapped.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            directory: str,
+            sample_rate: float = 0.01,
+            slow_ms: float = 500.0,
+            max_files: int = 100,
+    ):
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_files = max_files
+        self._profiler_active = False
+        self._in_flight = 0
+        self._started = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Tuple[str, float]] = []
+        token = _spans.set(spans)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._in_flight += 1
+        self._started += 1
+        started = self._started
+
+        # Only one cProfile instance can be enabled at a time per interpreter.
+        profiler = None
+        if self._in_flight == 1 and not self._profiler_active and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+            self._profiler_active = True
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._in_flight -= 1
+            if profiler is not None:
+                profiler.disable()
+                self._profiler_active = False
+            _spans.reset(token)
+
+        if profiler is None and duration_ms < self.slow_ms:
+            return
+
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "slow": duration_ms >= self.slow_ms,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "spans": [{"name": name, "duration_ms": round(ms, 3)} for name, ms in spans],
+            "profile": _format_profile(profiler) if profiler is not None else None,
+            "overlapped": self._started != started,
+        }
+        try:
+            await run_in_threadpool(self._write, record)
+        except OSError as e:
+            logger.error("Failed to write request profile: %s", e)
+
+    def _write(self, record: dict) -> None:
+        """
+        Writes a profile record and removes the oldest records above max_files.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.time_ns()}-{record['method']}.json"
+        with open(os.path.join(self.directory, name), "w") as file:
+            json.dump(record, file)
+        for old in list_profiles(self.directory)[self.max_files:]:
+            os.remove(os.path.join(self.directory, old))
+
+
+def _format_profile(profiler: cProfile.Profile, limit: int = 30) -> str:
+    """
+    Renders the top functions of a profile, sorted by cumulative time.
+    """
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def list_profiles(directory: str) -> List[str]:
+    """
+    Lists the profile files in the directory, newest first.
+    """
+    if not os.path.isdir(directory):
+        return []
+    return sorted((name for name in os.listdir(directory) if name.endswith(".json")), reverse=True)
@@ -1,24 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi_pagination import Page
 from fastapi_pagination.ext.motor import paginate as motor_paginate
+from pymongo import ReplaceOne
 from starlette.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
 
 from app.data import Announcement
-from app.dependencies import database, oauth2_scheme
+from app.dependencies import get_database, oauth2_scheme
+from app.logger import logger
+from app.profiling import ProfiledRoute, span
+from app.settings import settings
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 def get_collection_announcement():
-    return database.announcement
+    return get_database().announcement
+
+
+def get_collection_announcement_archive():
+    return get_database().announcement_archive
+
+
+def get_active_filter(now: datetime) -> dict:
+    """
+    Matches announcements that are published and not yet expired.
+    """
+    return {
+        "$and": [
+            {"$or": [{"publishAt": None}, {"publishAt": {"$lte": now}}]},
+            {"$or": [{"expiresAt": None}, {"expiresAt": {"$gt": now}}]},
+        ]
+    }
+
+
+def get_archivable_filter(now: datetime) -> dict:
+    """
+    Matches announcements that are expired, or older than
+    ANNOUNCEMENT_ARCHIVE_AFTER_DAYS when it is set.
+    """
+    conditions = [{"expiresAt": {"$lte": now}}]
+    if settings.ANNOUNCEMENT_ARCHIVE_AFTER_DAYS > 0:
+        conditions.append({"createdAt": {"$lte": now - timedelta(days=settings.ANNOUNCEMENT_ARCHIVE_AFTER_DAYS)}})
+    return {"$or": conditions}
 
 
 @router.get("", response_model=Page[Announcement])
-async def read_announcements(token: Annotated[str, Depends(oauth2_scheme)])-> Page[Announcement]:
-    return await motor_paginate(get_collection_announcement())
+async def read_announcements(
+        token: Annotated[str, Depends(oauth2_scheme)],
+        include_inactive: bool = False,
+) -> Page[Announcement]:
+    """
+    Retrieves the published, unexpired announcements.
+    Unpublished and expired announcements not yet archived are included with include_inactive.
+    """
+    query_filter = None if include_inactive else get_active_filter(datetime.now(timezone.utc))
+    with span("paginate"):
+        return await motor_paginate(get_collection_announcement(), query_filter)
 
 
 @router.get("/{id}")
@@ -26,7 +68,13 @@ async def read_announcement(
         id: str,
         token: Annotated[str, Depends(oauth2_scheme)],
 ) -> Announcement:
-    announcement = await get_collection_announcement().find_one(ObjectId(id))
+    """
+    Retrieves an announcement by ID, from the archive if it was archived.
+    """
+    with span("find_one"):
+        announcement = await get_collection_announcement().find_one(ObjectId(id))
+        if announcement is None:
+            announcement = await get_collection_announcement_archive().find_one(ObjectId(id))
     if announcement is None:
         raise HTTPException(status_code=404, detail="Announcement not found")
     return Announcement(**announcement)
@@ -45,7 +93,12 @@ async def delete_announcement(
         id: str,
         token: Annotated[str, Depends(oauth2_scheme)],
 ):
-    await get_collection_announcement().delete_one(ObjectId(id))
+    """
+    Deletes an announcement by ID, from the archive if it was archived.
+    """
+    result = await get_collection_announcement().delete_one(ObjectId(id))
+    if result.deleted_count == 0:
+        await get_collection_announcement_archive().delete_one(ObjectId(id))
 
 
 @router.put("/{id}")
@@ -54,4 +107,81 @@ async def update_announcement(
         announcement: Announcement,
         token: Annotated[str, Depends(oauth2_scheme)],
 ):
-    await get_collection_announcement().update_one({"_id": ObjectId(id)}, {"$set": announcement.model_dump(exclude={'id'})})
+    """
+    Updates an announcement by ID, in the archive if it was archived.
+    """
+    update = {"$set": announcement.model_dump(exclude={'id'})}
+    result = await get_collection_announcement().update_one({"_id": ObjectId(id)}, update)
+    if result.matched_count == 0:
+        await get_collection_announcement_archive().update_one({"_id": ObjectId(id)}, update)
+
+
+async def create_announcement_indexes() -> None:
+    """
+    Creates the indexes used by the active filter and the archiver, and the
+    TTL index that removes archived announcements after
+    ANNOUNCEMENT_ARCHIVE_RETENTION_DAYS.
+    """
+    collection = get_collection_announcement()
+    await collection.create_index("expiresAt")
+    await collection.create_index("publishAt")
+    if settings.ANNOUNCEMENT_ARCHIVE_AFTER_DAYS > 0:
+        await collection.create_index("createdAt")
+
+    archive = get_collection_announcement_archive()
+    retention_seconds = settings.ANNOUNCEMENT_ARCHIVE_RETENTION_DAYS * 24 * 60 * 60
+    existing = (await archive.index_information()).get("archivedAt_1")
+    if existing is None:
+        if retention_seconds > 0:
+            await archive.create_index("archivedAt", expireAfterSeconds=retention_seconds)
+    elif retention_seconds <= 0:
+        await archive.drop_index("archivedAt_1")
+    elif existing.get("expireAfterSeconds") != retention_seconds:
+        # create_index fails with IndexOptionsConflict when only the TTL changes.
+        await get_database().command(
+            "collMod",
+            archive.name,
+            index={"keyPattern": {"archivedAt": 1}, "expireAfterSeconds": retention_seconds},
+        )
+
+
+async def archive_announcements(batch_size: int) -> int:
+    """
+    Moves one batch of archivable announcements into the archive collection.
+    Returns the number of announcements moved.
+    """
+    collection = get_collection_announcement()
+    query_filter = get_archivable_filter(datetime.now(timezone.utc))
+    batch = await collection.find(query_filter).limit(batch_size).to_list(length=batch_size)
+    if not batch:
+        return 0
+    archived_at = datetime.now(timezone.utc)
+    # Upserts keep the move idempotent if a previous run stopped before the delete.
+    await get_collection_announcement_archive().bulk_write(
+        [ReplaceOne({"_id": doc["_id"]}, {**doc, "archivedAt": archived_at}, upsert=True) for doc in batch],
+        ordered=False,
+    )
+    await collection.delete_many({"$and": [{"_id": {"$in": [doc["_id"] for doc in batch]}}, query_filter]})
+    return len(batch)
+
+
+async def run_announcement_archiver() -> None:
+    """
+    Archives announcements every ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS until cancelled.
+    """
+    try:
+        await create_announcement_indexes()
+    except Exception as e:
+        logger.error("Failed to create announcement indexes: %s", e)
+    batch_size = settings.ANNOUNCEMENT_ARCHIVE_BATCH_SIZE
+    while True:
+        try:
+            archived = 0
+            while (count := await archive_announcements(batch_size)) == batch_size:
+                archived += count
+            archived += count
+            if archived:
+                logger.info("Archived %d announcements.", archived)
+        except Exception as e:
+            logger.error("Failed to archive announcements: %s", e)
+        await asyncio.sleep(settings.ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS)
@@ -4,37 +4,35 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import Annotated, Collection
 from datetime import datetime, timedelta
 from app.settings import settings
-from app.dependencies import database, oauth2_scheme
+from app.dependencies import get_database, get_pwd_context, oauth2_scheme
 from app.data import User, UserInDB, TokenData, Token
-from passlib.context import CryptContext
+from app.profiling import ProfiledRoute, span
 import jwt
 from jwt import InvalidTokenError
 from starlette.status import HTTP_401_UNAUTHORIZED
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 def get_collection_user() -> Collection:
     """
     Retrieves the user collection from the database.
     """
-    return database.user
+    return get_database().user
 
 
 def verify_password(plain_password, hashed_password) -> bool:
     """
     Verifies a plain password against a hashed password.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password) -> str:
     """
     Hashes the password using bcrypt.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 async def get_user(username: str, collection: Collection) -> dict | None:
@@ -99,11 +97,14 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    token_data = get_token_data(token, credentials_exception)
-    response = await get_user(username=token_data.username, collection=get_collection_user())
-    if response is None:
-        raise credentials_exception
-    return User(**response)
+    with span("get_current_user"):
+        with span("jwt_decode"):
+            token_data = get_token_data(token, credentials_exception)
+        with span("find_one"):
+            response = await get_user(username=token_data.username, collection=get_collection_user())
+        if response is None:
+            raise credentials_exception
+        return User(**response)
 
 
 async def get_current_active_user(
@@ -0,0 +1,35 @@
+import asyncio
+
+from fastapi import APIRouter, Request, Response
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from app.dependencies import get_database
+from app.logger import logger
+from app.profiling import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/live")
+async def read_liveness() -> dict:
+    """
+    Reports that the process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def read_readiness(request: Request, response: Response) -> dict:
+    """
+    Reports whether the application can serve traffic, along with startup timings.
+    Returns HTTP 503 if the database cannot be reached.
+    """
+    startup = request.app.state.startup
+    try:
+        await asyncio.wait_for(get_database().command("ping"), timeout=2)
+        status = "ok"
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        response.status_code = HTTP_503_SERVICE_UNAVAILABLE
+        status = "unavailable"
+    return {"status": status, **startup.report()}
@@ -0,0 +1,36 @@
+import json
+import os
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.data import User
+from app.data.user_role import UserRole
+from app.profiling import ProfiledRoute, list_profiles
+from app.require_role import RequireRole
+from app.settings import settings
+
+router = APIRouter(route_class=ProfiledRoute)
+
+admin = RequireRole([UserRole.ADMIN])
+
+
+@router.get("")
+async def read_profiles(current_user: Annotated[User, Depends(admin)]) -> List[str]:
+    """
+    Lists the recorded request profiles, newest first.
+    Requires the current user to have ADMIN role.
+    """
+    return list_profiles(settings.PROFILING_DIR)
+
+
+@router.get("/{name}")
+async def read_profile(name: str, current_user: Annotated[User, Depends(admin)]) -> dict:
+    """
+    Retrieves a recorded request profile by file name.
+    Requires the current user to have ADMIN role.
+    """
+    if name not in list_profiles(settings.PROFILING_DIR):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    with open(os.path.join(settings.PROFILING_DIR, name)) as file:
+        return json.load(file)
@@ -2,21 +2,21 @@ from typing import Annotated
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi_pagination import Page
-from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from pymongo.synchronous.collection import Collection
-from starlette.status import HTTP_201_CREATED
+from starlette.concurrency import run_in_threadpool
+from starlette.status import HTTP_201_CREATED, HTTP_409_CONFLICT
 from app.data import User, UserInDB, NewUserInDB
 from app.data.user_role import UserRole
-from app.dependencies import database, oauth2_scheme
+from app.dependencies import get_database, get_pwd_context, oauth2_scheme
 from app.require_role import RequireRole
 from app.settings import settings
 from app.logger import logger
+from app.profiling import ProfiledRoute, span
 from fastapi_pagination.ext.motor import paginate as motor_paginate
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 admin = RequireRole([UserRole.ADMIN])
 
@@ -25,13 +25,13 @@ def get_collection_user() -> Collection:
     """
     Retrieves the user collection from the database.
     """
-    return database.user
+    return get_database().user
 
 def get_password_hash(password) -> str:
     """
     Hashes the password using bcrypt.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 @router.get("")
 async def read_users(
@@ -43,7 +43,8 @@ async def read_users(
     Requires authentication via token.
     Requires the current user to have ADMIN role.
     """
-    return await motor_paginate(get_collection_user())
+    with span("paginate"):
+        return await motor_paginate(get_collection_user())
 
 @router.post("", status_code=HTTP_201_CREATED)
 async def create_user(
@@ -55,9 +56,13 @@ async def create_user(
     Creates a new user with hashed password.
     Requires authentication via token.
     Requires the current user to have ADMIN role.
+    Raises HTTP 409 if the username is already taken.
     """
     new_user = UserInDB(hashed_password=get_password_hash(user.password), **user.model_dump())
-    await  get_collection_user().insert_one(new_user.model_dump(mode='json'))
+    try:
+        await get_collection_user().insert_one(new_user.model_dump(mode='json'))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=HTTP_409_CONFLICT, detail="Username already exists")
     return User(**new_user.model_dump())
 
 @router.get("/{id}")
@@ -70,7 +75,8 @@ async def read_user(
     Requires authentication via token.
     Requires the current user to have ADMIN role.
     """
-    user = await get_collection_user().find_one({"_id": ObjectId(id)})
+    with span("find_one"):
+        user = await get_collection_user().find_one({"_id": ObjectId(id)})
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return User(**user)
@@ -104,38 +110,53 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
 
-async def create_default_admin() -> None:
+async def create_default_admin() -> bool:
     """
     Creates a default admin user on application startup.
     Uses ADMIN_USERNAME and ADMIN_PASSWORD from environment variables,
     or defaults to 'admin'/'admin123' for development.
+    Returns False if the admin user could not be created.
     """
     try:
         admin_username = settings.ADMIN_USERNAME
         admin_password = settings.ADMIN_PASSWORD
         
         collection = get_collection_user()
-        existing_admin = await collection.find_one(filter={"username": admin_username})
+        try:
+            await collection.create_index("username", unique=True)
+        except OperationFailure as e:
+            if e.code != 11000:
+                raise
+            # The admin user is still created, but concurrent startups may create it twice.
+            logger.error("Cannot create unique index on user.username, duplicate usernames exist: %s", e)
+        existing_admin = await collection.find_one(filter={"username": admin_username}, projection={"_id": 1})
         
         if existing_admin is not None:
-            logger.info(f"Default admin user '{admin_username}' already exists. Skipping creation.")
-            return
+            logger.info("Default admin user '%s' already exists. Skipping creation.", admin_username)
+            return True
         
         new_admin = UserInDB(
             username=admin_username,
             full_name="Administrator",
             email="admin@dayder.com",
-            hashed_password=get_password_hash(admin_password),
+            hashed_password=await run_in_threadpool(get_password_hash, admin_password),
             disabled=False,
             role=UserRole.ADMIN,
         )
         
-        await collection.insert_one(new_admin.model_dump(mode='json'))
+        try:
+            await collection.insert_one(new_admin.model_dump(mode='json'))
+        except DuplicateKeyError:
+            # Another instance created the admin user since the check above.
+            logger.info("Default admin user '%s' already exists. Skipping creation.", admin_username)
+            return True
         
         if admin_password == "admin123":
-            logger.warning(f"Default admin user '{admin_username}' created with default password 'admin123'. Please change this in production!")
+            logger.warning("Default admin user '%s' created with default password 'admin123'. Please change this in production!", admin_username)
         else:
-            logger.info(f"Default admin user '{admin_username}' created successfully.")
+            logger.info("Default admin user '%s' created successfully.", admin_username)
+        return True
         
     except Exception as e:
-        logger.error(f"Failed to create default admin user: {str(e)}")
+        logger.error("Failed to create default admin user: %s", e)
+        return False
@@ -6,9 +6,22 @@ load_dotenv()
 class Settings:
     ADMIN_USERNAME: str = os.getenv("ADMIN_USERNAME", "admin")
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "admin123")
+    ADMIN_BOOTSTRAP: str = os.getenv("ADMIN_BOOTSTRAP", "background")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "fallback-secret-key")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     MONGO_URL: str = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+    ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS", "300"))
+    ANNOUNCEMENT_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ANNOUNCEMENT_ARCHIVE_BATCH_SIZE", "500"))
+    ANNOUNCEMENT_ARCHIVE_AFTER_DAYS: int = int(os.getenv("ANNOUNCEMENT_ARCHIVE_AFTER_DAYS", "0"))
+    ANNOUNCEMENT_ARCHIVE_RETENTION_DAYS: int = int(os.getenv("ANNOUNCEMENT_ARCHIVE_RETENTION_DAYS", "0"))
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+    PROFILING_SLOW_MS: float = float(os.getenv("PROFILING_SLOW_MS", "500"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_MAX_FILES: int = int(os.getenv("PROFILING_MAX_FILES", "100"))
 
 settings = Settings()
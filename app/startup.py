@@ -0,0 +1,22 @@
+import time
+
+from app import IMPORT_STARTED
+
+
+class StartupReport:
+    """
+    Collects import and startup timings and the state of the default admin bootstrap.
+    Must be created once the application modules are imported.
+    """
+
+    def __init__(self):
+        self.import_ms = (time.perf_counter() - IMPORT_STARTED) * 1000
+        self.startup_ms: float | None = None
+        self.admin_bootstrap = "pending"
+
+    def report(self) -> dict:
+        return {
+            "import_ms": round(self.import_ms, 1),
+            "startup_ms": round(self.startup_ms, 1) if self.startup_ms is not None else None,
+            "admin_bootstrap": self.admin_bootstrap,
+        }
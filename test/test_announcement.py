@@ -1,6 +1,8 @@
+import asyncio
 from unittest.mock import patch, Mock, AsyncMock
 from fastapi.testclient import TestClient
 from app.main import app
+from app.routers import announcements
 
 client = TestClient(app)
 
@@ -12,7 +14,9 @@ mongo_response = {
     "description": "description",
     "thumbnail": "thumbnail",
     "createdAt": "2024-10-29T09:58:52.102000",
-    "updatedAt": "2024-10-29T09:58:52.102000"
+    "updatedAt": "2024-10-29T09:58:52.102000",
+    "publishAt": None,
+    "expiresAt": None
 }
 
 pagination = {
@@ -26,7 +30,7 @@ pagination = {
 collection = Mock()
 collection.find_one = AsyncMock(return_value=mongo_response)
 collection.insert_one = AsyncMock()
-collection.delete_one = AsyncMock()
+collection.delete_one = AsyncMock(return_value=Mock(deleted_count=1))
 
 collection_failed = Mock()
 collection_failed.find_one = AsyncMock(return_value=None)
@@ -38,6 +42,15 @@ def test_read_announcements(mock_motor_paginate, mock_auth):
     response = client.get("/api/announcements")
     assert response.status_code == 200
     assert response.json() == pagination
+    assert mock_motor_paginate.call_args.args[1] is not None
+
+
+@patch("app.dependencies.oauth2_scheme", return_value="fake-token")
+@patch("app.routers.announcements.motor_paginate", return_value=pagination)
+def test_read_announcements_including_inactive(mock_motor_paginate, mock_auth):
+    response = client.get("/api/announcements", params={"include_inactive": True})
+    assert response.status_code == 200
+    assert mock_motor_paginate.call_args.args[1] is None
 
 
 @patch("app.dependencies.oauth2_scheme", return_value="fake-token")
@@ -49,8 +62,18 @@ def test_read_announcement_by_id(mock_collection, mock_auth):
 
 
 @patch("app.dependencies.oauth2_scheme", return_value="fake-token")
+@patch("app.routers.announcements.get_collection_announcement_archive", return_value=collection)
+@patch("app.routers.announcements.get_collection_announcement", return_value=collection_failed)
+def test_read_archived_announcement_by_id(mock_collection, mock_archive, mock_auth):
+    response = client.get("/api/announcements/6725225a2dc0df1bda38d279")
+    assert response.status_code == 200
+    assert response.json() == mongo_response
+
+
+@patch("app.dependencies.oauth2_scheme", return_value="fake-token")
+@patch("app.routers.announcements.get_collection_announcement_archive", return_value=collection_failed)
 @patch("app.routers.announcements.get_collection_announcement", return_value=collection_failed)
-def test_read_announcement_by_id_failed(mock_collection, mock_auth):
+def test_read_announcement_by_id_failed(mock_collection, mock_archive, mock_auth):
     response = client.get("/api/announcements/6725225a2dc0df1bda38d279")
     assert response.status_code == 404
     assert response.json() == {'detail': 'Announcement not found'}
@@ -72,3 +95,94 @@ def test_create_announcement(mock_collection, mock_auth):
 def test_delete_announcement(mock_collection, mock_auth):
     response = client.delete("/api/announcements/6725225a2dc0df1bda38d279")
     assert response.status_code == 204
+
+
+@patch("app.dependencies.oauth2_scheme", return_value="fake-token")
+def test_delete_archived_announcement(mock_auth):
+    collection_hot = Mock()
+    collection_hot.delete_one = AsyncMock(return_value=Mock(deleted_count=0))
+    collection_archive = Mock()
+    collection_archive.delete_one = AsyncMock(return_value=Mock(deleted_count=1))
+    with patch("app.routers.announcements.get_collection_announcement", return_value=collection_hot), \
+            patch("app.routers.announcements.get_collection_announcement_archive", return_value=collection_archive):
+        response = client.delete("/api/announcements/6725225a2dc0df1bda38d279")
+    assert response.status_code == 204
+    collection_archive.delete_one.assert_awaited_once()
+
+
+def test_archive_announcements():
+    cursor = Mock()
+    cursor.limit.return_value.to_list = AsyncMock(return_value=[{"_id": "id", "title": "title"}])
+    collection_hot = Mock()
+    collection_hot.find.return_value = cursor
+    collection_hot.delete_many = AsyncMock()
+    collection_archive = Mock()
+    collection_archive.bulk_write = AsyncMock()
+    with patch("app.routers.announcements.get_collection_announcement", return_value=collection_hot), \
+            patch("app.routers.announcements.get_collection_announcement_archive", return_value=collection_archive):
+        archived = asyncio.run(announcements.archive_announcements(batch_size=10))
+    assert archived == 1
+    cursor.limit.assert_called_once_with(10)
+    collection_archive.bulk_write.assert_awaited_once()
+    collection_hot.delete_many.assert_awaited_once()
+
+
+def test_archive_announcements_empty():
+    cursor = Mock()
+    cursor.limit.return_value.to_list = AsyncMock(return_value=[])
+    collection_hot = Mock()
+    collection_hot.find.return_value = cursor
+    collection_hot.delete_many = AsyncMock()
+    with patch("app.routers.announcements.get_collection_announcement", return_value=collection_hot):
+        archived = asyncio.run(announcements.archive_announcements(batch_size=10))
+    assert archived == 0
+    collection_hot.delete_many.assert_not_awaited()
+
+
+def create_index_collections(index_information):
+    collection_hot = Mock()
+    collection_hot.create_index = AsyncMock()
+    collection_archive = Mock()
+    collection_archive.name = "announcement_archive"
+    collection_archive.index_information = AsyncMock(return_value=index_information)
+    collection_archive.create_index = AsyncMock()
+    collection_archive.drop_index = AsyncMock()
+    database = Mock()
+    database.command = AsyncMock()
+    return collection_hot, collection_archive, database
+
+
+def run_create_announcement_indexes(collection_hot, collection_archive, database, retention_days):
+    with patch("app.routers.announcements.get_collection_announcement", return_value=collection_hot), \
+            patch("app.routers.announcements.get_collection_announcement_archive", return_value=collection_archive), \
+            patch("app.routers.announcements.get_database", return_value=database), \
+            patch("app.routers.announcements.settings.ANNOUNCEMENT_ARCHIVE_RETENTION_DAYS", retention_days):
+        asyncio.run(announcements.create_announcement_indexes())
+
+
+def test_create_announcement_indexes_creates_ttl_index():
+    collection_hot, collection_archive, database = create_index_collections({"_id_": {}})
+    run_create_announcement_indexes(collection_hot, collection_archive, database, retention_days=1)
+    collection_archive.create_index.assert_awaited_once_with("archivedAt", expireAfterSeconds=86400)
+    database.command.assert_not_awaited()
+
+
+def test_create_announcement_indexes_updates_ttl_index():
+    collection_hot, collection_archive, database = create_index_collections(
+        {"archivedAt_1": {"key": [("archivedAt", 1)], "expireAfterSeconds": 86400}}
+    )
+    run_create_announcement_indexes(collection_hot, collection_archive, database, retention_days=2)
+    collection_archive.create_index.assert_not_awaited()
+    database.command.assert_awaited_once_with(
+        "collMod",
+        "announcement_archive",
+        index={"keyPattern": {"archivedAt": 1}, "expireAfterSeconds": 172800},
+    )
+
+
+def test_create_announcement_indexes_drops_ttl_index_without_retention():
+    collection_hot, collection_archive, database = create_index_collections(
+        {"archivedAt_1": {"key": [("archivedAt", 1)], "expireAfterSeconds": 86400}}
+    )
+    run_create_announcement_indexes(collection_hot, collection_archive, database, retention_days=0)
+    collection_archive.drop_index.assert_awaited_once_with("archivedAt_1")
@@ -0,0 +1,56 @@
+from unittest.mock import Mock, AsyncMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+database = Mock()
+database.command = AsyncMock(return_value={"ok": 1})
+
+database_failed = Mock()
+database_failed.command = AsyncMock(side_effect=Exception("unreachable"))
+
+collection_index_failed = Mock()
+collection_index_failed.create_index = AsyncMock(side_effect=Exception("index failed"))
+
+
+def test_read_liveness():
+    response = client.get("/api/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@patch("app.routers.health.get_database", return_value=database)
+def test_read_readiness(mock_database):
+    response = client.get("/api/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert response.json()["import_ms"] > 0
+
+
+@patch("app.routers.health.get_database", return_value=database_failed)
+def test_read_readiness_failure(mock_database):
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+
+@patch("app.main.settings.ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS", 0)
+@patch("app.routers.health.get_database", return_value=database)
+@patch("app.routers.users.create_default_admin", new_callable=AsyncMock, return_value=True)
+def test_startup_bootstraps_admin_in_background(mock_create_default_admin, mock_database):
+    with TestClient(app) as startup_client:
+        response = startup_client.get("/api/health/ready")
+    assert response.json()["startup_ms"] is not None
+    assert response.json()["admin_bootstrap"] == "done"
+    mock_create_default_admin.assert_awaited_once()
+
+
+@patch("app.main.settings.ANNOUNCEMENT_ARCHIVE_INTERVAL_SECONDS", 0)
+@patch("app.routers.health.get_database", return_value=database)
+@patch("app.routers.users.get_collection_user", return_value=collection_index_failed)
+def test_startup_bootstrap_failure_is_reported(mock_collection, mock_database):
+    with TestClient(app) as startup_client:
+        response = startup_client.get("/api/health/ready")
+    assert response.json()["admin_bootstrap"] == "failed"
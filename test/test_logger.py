@@ -0,0 +1,118 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.logger import (
+    AccessLogMiddleware,
+    _queue_handler,
+    _stream_handler,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    configure_uvicorn_logging,
+    logger,
+    request_id_var,
+    start_logging,
+    stop_logging,
+)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AccessLogMiddleware, sample_rate=0.0)
+
+    @app.get("/request-id")
+    async def read_request_id():
+        return {"request_id": request_id_var.get()}
+
+    return app
+
+
+client = TestClient(create_app())
+
+
+def create_record(message: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("app", logging.INFO, __file__, 1, message, args, None)
+
+
+def test_request_id_is_generated():
+    response = client.get("/request-id")
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == response.json()["request_id"]
+
+
+def test_request_id_is_taken_from_header():
+    response = client.get("/request-id", headers={"X-Request-ID": "abc"})
+    assert response.json() == {"request_id": "abc"}
+    assert response.headers["x-request-id"] == "abc"
+
+
+def test_json_formatter():
+    record = create_record("created '%s'", "admin")
+    record.request_id = "abc"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "created 'admin'"
+    assert entry["request_id"] == "abc"
+    assert entry["level"] == "INFO"
+
+
+def test_request_id_filter():
+    token = request_id_var.set("abc")
+    record = create_record("message")
+    RequestIdFilter().filter(record)
+    request_id_var.reset(token)
+    assert record.request_id == "abc"
+
+
+def test_queue_handler_renders_message_and_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    args = ["first"]
+    handler.emit(create_record("message %s", args))
+    handler.emit(create_record("second"))
+    args.append("changed")
+    queued = handler.queue.get_nowait()
+    assert queued.msg == "message ['first']"
+    assert queued.args is None
+    assert handler.dropped == 1
+
+
+def test_queue_handler_renders_exception():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    try:
+        raise ValueError("failed")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "message", None, sys.exc_info())
+    handler.emit(record)
+    queued = handler.queue.get_nowait()
+    assert queued.exc_info is None
+    entry = json.loads(JsonFormatter().format(queued))
+    assert "ValueError: failed" in entry["exception"]
+
+
+@pytest.fixture
+def restore_loggers():
+    loggers = [logging.getLogger(name) for name in ("app", "uvicorn", "uvicorn.error", "uvicorn.access")]
+    saved = [(item, item.handlers[:], item.propagate) for item in loggers]
+    yield
+    for item, handlers, propagate in saved:
+        item.handlers = handlers
+        item.propagate = propagate
+
+
+def test_uvicorn_access_log_is_disabled(restore_loggers):
+    configure_uvicorn_logging()
+    assert not logging.getLogger("uvicorn.access").hasHandlers()
+    assert logging.getLogger("uvicorn.error").hasHandlers()
+
+
+def test_records_after_shutdown_are_written_directly(restore_loggers):
+    start_logging()
+    assert logger.handlers == [_queue_handler]
+    stop_logging()
+    assert logger.handlers == [_stream_handler]
+    assert logging.getLogger("uvicorn").handlers == [_stream_handler]
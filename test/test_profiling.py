@@ -0,0 +1,81 @@
+import json
+import os
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from pydantic import BaseModel
+
+from app.profiling import ProfiledJSONResponse, ProfiledRoute, ProfilingMiddleware, list_profiles, span
+
+
+class Items(BaseModel):
+    items: list
+
+
+def create_app(directory, sample_rate, slow_ms, max_files=100) -> FastAPI:
+    app = FastAPI(default_response_class=ProfiledJSONResponse)
+    app.router.route_class = ProfiledRoute
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=str(directory),
+        sample_rate=sample_rate,
+        slow_ms=slow_ms,
+        max_files=max_files,
+    )
+
+    @app.get("/items")
+    async def read_items() -> Items:
+        with span("find_one"):
+            return Items(items=[])
+
+    return app
+
+
+def read_record(directory, name) -> dict:
+    with open(os.path.join(directory, name)) as file:
+        return json.load(file)
+
+
+@patch("app.profiling.settings.PROFILING_ENABLED", True)
+def test_sampled_request_is_profiled(tmp_path):
+    client = TestClient(create_app(tmp_path, sample_rate=1.0, slow_ms=10_000))
+    response = client.get("/items")
+    assert response.status_code == 200
+    profiles = list_profiles(str(tmp_path))
+    assert len(profiles) == 1
+    record = read_record(tmp_path, profiles[0])
+    assert record["path"] == "/items"
+    assert record["status_code"] == 200
+    assert record["profile"] is not None
+    assert record["overlapped"] is False
+    assert [s["name"] for s in record["spans"]] == ["find_one", "validate_response", "serialize_response", "render"]
+
+
+def test_unsampled_fast_request_is_not_recorded(tmp_path):
+    client = TestClient(create_app(tmp_path, sample_rate=0.0, slow_ms=10_000))
+    client.get("/items")
+    assert list_profiles(str(tmp_path)) == []
+
+
+def test_slow_request_records_spans_without_profile(tmp_path):
+    client = TestClient(create_app(tmp_path, sample_rate=0.0, slow_ms=0))
+    client.get("/items")
+    profiles = list_profiles(str(tmp_path))
+    assert len(profiles) == 1
+    record = read_record(tmp_path, profiles[0])
+    assert record["slow"] is True
+    assert record["profile"] is None
+
+
+def test_profiles_are_rotated(tmp_path):
+    client = TestClient(create_app(tmp_path, sample_rate=0.0, slow_ms=0, max_files=2))
+    for _ in range(4):
+        client.get("/items")
+    assert len(list_profiles(str(tmp_path))) == 2
+
+
+def test_span_outside_request_is_noop():
+    with span("find_one"):
+        pass
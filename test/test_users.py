@@ -1,12 +1,15 @@
+import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
 
 from app.data import UserInDB, User, NewUserInDB
 from app.data.user_role import UserRole
 from app.main import app
 from app.routers.authentication import get_current_active_user
 from app.dependencies import oauth2_scheme
+from app.routers import users
 
 user = {
     "_id": ObjectId("507f1f77bcf86cd799439011"),
@@ -71,6 +74,21 @@ def test_create_user(mock_current_user, mock_auth,mock_collection):
     assert response.json()["username"] == "newuser"
 
 
+@patch("app.dependencies.oauth2_scheme", return_value="fake-token")
+@patch("app.routers.users.admin", return_value=user_in_db)
+def test_create_user_duplicate_username(mock_current_user, mock_auth):
+    collection_duplicate = Mock()
+    collection_duplicate.insert_one = AsyncMock(side_effect=DuplicateKeyError("duplicate"))
+    new_user_data = {
+        "username": "testuser",
+        "password": "password123",
+    }
+    with patch("app.routers.users.get_collection_user", return_value=collection_duplicate):
+        response = client.post("/api/users", json=new_user_data, headers={"Authorization": "Bearer fake-token"})
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Username already exists"}
+
+
 @patch("app.routers.users.get_collection_user", return_value=collection)
 @patch("app.dependencies.oauth2_scheme", return_value="fake-token")
 @patch("app.routers.users.admin", return_value=user_in_db)
@@ -86,3 +104,25 @@ def test_read_user_by_id(mock_current_user, mock_auth,mock_collection):
 def test_read_user_by_id_not_found(mock_current_user, mock_auth,mock_collection):
     response = client.get("/api/users/507f1f77bcf86cd799439011", headers={"Authorization": "Bearer fake-token"})
     assert response.status_code == 404
+
+
+@patch("app.routers.users.get_password_hash", return_value="fake-hashed-password")
+def test_create_default_admin_created_concurrently(mock_hash):
+    collection_race = Mock()
+    collection_race.create_index = AsyncMock()
+    collection_race.find_one = AsyncMock(return_value=None)
+    collection_race.insert_one = AsyncMock(side_effect=DuplicateKeyError("duplicate"))
+    with patch("app.routers.users.get_collection_user", return_value=collection_race):
+        assert asyncio.run(users.create_default_admin()) is True
+    collection_race.create_index.assert_awaited_once_with("username", unique=True)
+
+
+@patch("app.routers.users.get_password_hash", return_value="fake-hashed-password")
+def test_create_default_admin_with_duplicate_usernames(mock_hash):
+    collection_duplicates = Mock()
+    collection_duplicates.create_index = AsyncMock(side_effect=OperationFailure("duplicate key", code=11000))
+    collection_duplicates.find_one = AsyncMock(return_value=None)
+    collection_duplicates.insert_one = AsyncMock()
+    with patch("app.routers.users.get_collection_user", return_value=collection_duplicates):
+        assert asyncio.run(users.create_default_admin()) is True
+    collection_duplicates.insert_one.assert_awaited_once()